@@ -1,10 +1,34 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
 from flask import request
 from flask_restplus import Namespace, Resource, fields
 
 from compiler.manager import GccManager
+from pragcc.core import parallelizer
 from . import data
 
 
+# Seconds a request waits for the compilation of its code
+COMPILE_TIMEOUT = 30
+
+# Body of the availability check, it is never modified
+AVAILABLE = {}
+
+# Parses the codes that compile while their response is sent, a code
+# arriving while another one is parsed is not parsed, so codes sent at
+# keystroke rate do not pile up
+PRELOADER = ThreadPoolExecutor(max_workers=1)
+PRELOADING = threading.BoundedSemaphore(1)
+
+
+def preload_code(raw_c_code):
+    try:
+        parallelizer.preload_code(raw_c_code)
+    finally:
+        PRELOADING.release()
+
+
 # Defining the name space for Catt cafile
 api = Namespace('compiler',description='Check if the given c source code can be compiled successfully.')
 
@@ -26,8 +50,7 @@ class Gcc(Resource):
 
     def head(self):
         """Used for clients to check if the resource is available."""
-        data = {}
-        return data
+        return AVAILABLE
 
     @api.expect(CCode)
     def post(self):
@@ -40,8 +63,21 @@ class Gcc(Resource):
             message = 'Raw c code was not provided'
             return message, 400
 
+        # A code compiled recently is not compiled again, the others
+        # requests arriving close in time share a single gcc process
         manager = GccManager()
-        stdout, stderror = manager.compile_raw_code(raw_c_code)
+        result = manager.get_cached_result(raw_c_code)
+        cached = result is not None
+        if not cached:
+            try:
+                result = manager.submit(raw_c_code).result(
+                    timeout=COMPILE_TIMEOUT
+                )
+            except TimeoutError:
+                message = 'The code took too long to be compiled'
+                return message, 504
+
+        stdout, stderror = result
 
         if stderror:
             message = {
@@ -54,6 +90,11 @@ class Gcc(Resource):
 
             return message, 400
 
+        # The code is usually parallelized next, so it is parsed now, a
+        # cached code was most likely parsed when it was compiled
+        if not cached and PRELOADING.acquire(blocking=False):
+            PRELOADER.submit(preload_code,raw_c_code)
+
         data = {
             'message':'Compilation successfull !!'
         }
@@ -1,25 +1,549 @@
 import tempfile
 import subprocess
+import threading
+import queue
+import re
 import os
+import signal
+import time
+import hashlib
+import functools
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from clang import cindex
+except ImportError:
+    cindex = None
+
+
+GCC_FLAGS = ('-fsyntax-only',)
+"""tuple: Flags given to gcc to check if a C source code compiles."""
+
+def _temp_dir():
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm,os.W_OK | os.X_OK):
+        return shm
+    return None
+
+TEMP_DIR = _temp_dir()
+"""str: Directory for the files given to gcc, /dev/shm is RAM backed and
+used when present, otherwise it is None and the system default is used.
+"""
+
+GCC_TIMEOUT = 10
+"""int: Seconds gcc is given to check a code, or a batch of codes."""
+
+CACHE_SIZE = 4096
+"""int: Number of compilation results kept in memory."""
+
+EXECUTOR = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+"""ThreadPoolExecutor: Compiles the snippets of a batch that are checked
+on their own, so they do not wait for each other.
+"""
+
+BATCH_INTERVAL = 0.01
+"""float: Seconds a batch waits to gather snippets before calling gcc."""
+
+GCC_WORKERS = int(os.environ.get('PRAGCC_GCC_WORKERS',os.cpu_count() or 1))
+"""int: Number of long-lived gcc workers, 0 starts a gcc process per check."""
+
+WORKER_SCRIPT = 'while read -r path; do gcc "$@" "$path" </dev/null 2>&1; echo __END__; done'
+"""str: Shell loop run by each worker, it checks one file path per line."""
+
+WORKER_END = '__END__\n'
+"""str: Written by a worker after the diagnostics of each file."""
+
+SNIPPET_LINE = r'^(?P<include>In file included from |\s+from )?%s/snippet_(?P<index>\d+)\.c:'
+"""str: Pattern of the gcc lines naming a snippet of a batch, formatted
+with the escaped batch directory, so the source lines echoed by gcc do 
+not match it.
+"""
+
+USE_LIBCLANG = os.environ.get('PRAGCC_USE_LIBCLANG','') == '1'
+"""bool: Check the code in-process with libclang instead of calling gcc.
+It is enabled by setting the PRAGCC_USE_LIBCLANG environment variable 
+to 1, and it only takes effect if the clang bindings can be loaded.
+"""
+
+
+def _create_index():
+    if not (USE_LIBCLANG and cindex):
+        return None
+
+    try:
+        return cindex.Index.create()
+    except cindex.LibclangError:
+        return None
+
+INDEX = _create_index()
+"""clang.cindex.Index: Shared by every libclang syntax check, or None
+when the libclang check is disabled or unavailable.
+"""
+
+
+def _toolchain_digest():
+    if INDEX is not None:
+        version = cindex.conf.lib.clang_getClangVersion()
+    else:
+        try:
+            version = subprocess.run(
+                args=['gcc','--version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                universal_newlines=True
+            ).stdout
+        except OSError:
+            version = ''
+
+    return hashlib.sha256(str(version).encode()).digest()
+
+TOOLCHAIN_DIGEST = _toolchain_digest()
+"""bytes: Identifies the compiler version, compilation results obtained
+with a different compiler are not reused.
+"""
+
+
+def libclang_syntax_check(raw_c_code):
+    """Check if the given C99 source code compiles using libclang.
+
+    The code is parsed in-process, so no compiler process is started.
+    Function bodies are not skipped since most errors are found there.
+
+    Args:
+        raw_c_code (str): The C source code to be checked.
+
+    Returns:
+        tuple(str,str), an empty stdout and the errors found, if any.
+    """
+    translation_unit = INDEX.parse(
+        'snippet.c',
+        args=['-fsyntax-only','-std=c99'],
+        unsaved_files=[('snippet.c',raw_c_code)],
+        options=cindex.TranslationUnit.PARSE_INCOMPLETE
+    )
+
+    errors = ''
+    for diagnostic in translation_unit.diagnostics:
+        if diagnostic.severity >= cindex.Diagnostic.Error:
+            location = diagnostic.location
+            errors += '%s:%d:%d: error: %s\n' % (
+                location.file or 'snippet.c',
+                location.line,
+                location.column,
+                diagnostic.spelling
+            )
+
+    return '', errors
+
+
+def run_gcc(args,input=None):
+    """Run gcc and return its completed process.
+
+    gcc runs in its own process group, so when it takes more than
+    GCC_TIMEOUT seconds the compiler processes it started are killed
+    along with it and their pipes get closed.
+
+    Args:
+        args (List[str]): The gcc command line.
+        input (Optional[str]): Given to gcc through its standard input,
+            otherwise gcc reads nothing from it.
+
+    Raises:
+        subprocess.TimeoutExpired: If gcc took more than GCC_TIMEOUT seconds.
+    """
+    process = subprocess.Popen(
+        args=args,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        start_new_session=True
+    )
+
+    try:
+        stdout, stderr = process.communicate(input,timeout=GCC_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid,signal.SIGKILL)
+        process.communicate()
+        raise
+
+    return subprocess.CompletedProcess(args,process.returncode,stdout,stderr)
+
+
+def _resolve(future,compilation):
+    """Give the outcome of a finished compilation future to another future."""
+    error = compilation.exception()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(compilation.result())
+
+
+class GccWorker(object):
+    """A shell process that runs gcc over the file paths it receives.
+
+    Talking to an already running shell saves forking the Python 
+    interpreter process on each compilation.
+    """
+
+    def __init__(self,flags):
+        self._killed = False
+        self._process = subprocess.Popen(
+            args=['sh','-c',WORKER_SCRIPT,'sh'] + list(flags),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            start_new_session=True
+        )
+
+    @property
+    def killed(self):
+        """bool: True if the worker was killed and can not be used again."""
+        return self._killed
+
+    def kill(self):
+        """Kill the shell and the gcc processes it is running."""
+        self._killed = True
+        try:
+            os.killpg(self._process.pid,signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def close(self):
+        """Kill the worker and wait for it to finish."""
+        self.kill()
+        self._process.wait()
+        self._process.stdin.close()
+        self._process.stdout.close()
+
+    def compile_file(self,file_path):
+        """Check the given file and return its (stdout, stderr) tuple.
+
+        Raises:
+            subprocess.TimeoutExpired: If gcc took more than GCC_TIMEOUT
+                seconds, the worker is killed and can not be used again.
+        """
+        # Killing the worker makes it close its output, so the
+        # following reading does not wait any longer
+        deadline = threading.Timer(GCC_TIMEOUT,self.kill)
+        deadline.start()
+
+        try:
+            self._process.stdin.write(file_path + '\n')
+            self._process.stdin.flush()
+
+            output = ''
+            line = self._process.stdout.readline()
+            while line and line != WORKER_END:
+                output += line
+                line = self._process.stdout.readline()
+        finally:
+            deadline.cancel()
+
+        # The deadline may expire once the whole output was read, then
+        # the output is still good, only the worker is lost
+        if line != WORKER_END:
+            if self._killed:
+                raise subprocess.TimeoutExpired(file_path,GCC_TIMEOUT)
+            raise OSError('The gcc worker exited unexpectedly')
+
+        return '', output
+
+
+class GccPool(object):
+    """A fixed set of GccWorker objects shared by every request."""
+
+    def __init__(self,flags,size):
+        self._flags = flags
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(GccWorker(flags))
+
+    def compile_file(self,file_path):
+        """Check the given file with the first idle worker.
+
+        A worker that fails or takes too long is replaced by a new one.
+        """
+        worker = self._idle.get()
+        try:
+            return worker.compile_file(file_path)
+        except (OSError,ValueError,subprocess.TimeoutExpired):
+            worker.kill()
+            raise
+        finally:
+            if worker.killed:
+                worker.close()
+                worker = GccWorker(self._flags)
+            self._idle.put(worker)
+
+    def close(self):
+        """Close the idle workers, the pool can not be used anymore."""
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class GccBatch(object):
+    """Coalesces the snippets submitted in a short time window.
+
+    All the snippets gathered during BATCH_INTERVAL seconds are written
+    in the same temporary directory and checked by a single gcc process,
+    so the process startup cost is paid once per batch instead of once
+    per snippet.
+    """
+
+    def __init__(self,flags):
+        self._flags = flags
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run,daemon=True)
+        self._worker.start()
+
+    def submit(self,text):
+        """Enqueue a snippet to be compiled in the next batch.
+
+        Args:
+            text (str): The C source code to be compiled.
+
+        Returns:
+            concurrent.futures.Future, resolves to a (stdout, stderr) tuple.
+        """
+        future = Future()
+        self._queue.put((text,future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            time.sleep(BATCH_INTERVAL)
+
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            # Gathering the next batch does not wait for this one
+            EXECUTOR.submit(self._flush_or_fail,pending)
+
+    def _flush_or_fail(self,pending):
+        try:
+            self._flush(pending)
+        except Exception as error:
+            for text, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+
+    def _compile_each(self,manager,pending):
+        """Compile each pending snippet on its own in the EXECUTOR threads,
+        so the worker is free to gather the next batch meanwhile.
+        """
+        for text, future in pending:
+            compilation = EXECUTOR.submit(manager.compile_raw_code,text)
+            compilation.add_done_callback(
+                functools.partial(_resolve,future)
+            )
+
+    def _flush(self,pending):
+        manager = GccManager(flags=self._flags)
+
+        if len(pending) == 1:
+            self._compile_each(manager,pending)
+            return
+
+        with tempfile.TemporaryDirectory(dir=TEMP_DIR) as dir_path:
+            file_paths = []
+            for index, (text, future) in enumerate(pending):
+                file_path = os.path.join(dir_path,'snippet_%d.c' % index)
+                with open(file_path,'w') as file:
+                    file.write(text)
+                file_paths.append(file_path)
+
+            try:
+                process = run_gcc(['gcc'] + list(self._flags) + file_paths)
+            except subprocess.TimeoutExpired:
+                process = None
+
+        # At least one snippet does not compile or takes too long, each 
+        # snippet is compiled again on its own so errors are reported 
+        # against the right file, and only a slow snippet waits for gcc.
+        if process is None or process.returncode != 0:
+            self._compile_each(manager,pending)
+            return
+
+        # Warnings do not make gcc fail, they are routed to their snippet.
+        stderrs = self._route(dir_path,process.stderr,len(pending))
+        if stderrs is None:
+            self._compile_each(manager,pending)
+            return
+
+        for (text, future), stderr in zip(pending,stderrs):
+            result = ('',stderr)
+            manager.cache_result(text,result)
+            future.set_result(result)
+
+    def _route(self,dir_path,stderr,count):
+        """Split the gcc diagnostics of a batch by snippet.
+
+        Args:
+            dir_path (str): The directory of the batch snippets.
+            stderr (str): The diagnostics given by gcc.
+            count (int): The number of snippets in the batch.
+
+        Returns:
+            List[str], the diagnostics of each snippet, or None if some 
+                line can not be routed with certainty.
+        """
+        snippet_line = re.compile(SNIPPET_LINE % re.escape(dir_path))
+
+        stderrs = [''] * count
+        index = None
+        chain_ended = False
+        held = ''
+
+        for line in stderr.splitlines(True):
+            # An include chain belongs to the snippet named at its end
+            if line.startswith('In file included from '):
+                index = None
+
+            match = snippet_line.match(line)
+            if match:
+                snippet = int(match.group('index'))
+                if snippet not in range(count):
+                    return None
+
+                # A snippet included by another one, its diagnostics
+                # would be reported to both of them
+                if match.group('include') and index is not None:
+                    return None
+                if chain_ended and snippet != index:
+                    return None
+
+                index = snippet
+
+            chain_ended = match is not None and match.group('include') is not None
+
+            if index is None:
+                held += line
+            else:
+                stderrs[index] += held + line
+                held = ''
+
+        if held:
+            return None
+
+        return stderrs
+
 
 class GccManager(object):
 
+    _batches = {}
+    _batches_lock = threading.Lock()
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    _results = collections.OrderedDict()
+    _results_lock = threading.Lock()
+
+    def __init__(self,flags=GCC_FLAGS):
+        self._flags = tuple(flags)
+        self._pool = None
+
+        # Workers are started once and shared by every manager
+        if GCC_WORKERS and INDEX is None:
+            with GccManager._pools_lock:
+                self._pool = GccManager._pools.get(self._flags)
+                if self._pool is None:
+                    self._pool = GccPool(self._flags,GCC_WORKERS)
+                    GccManager._pools[self._flags] = self._pool
+
+    def _cache_key(self,text):
+        digest = hashlib.sha256(text.encode()).digest()
+        return digest, TOOLCHAIN_DIGEST, self._flags
+
+    def get_cached_result(self,text):
+        """Return the result of a previous compilation of the given code.
+
+        Args:
+            text (str): The C source code to be compiled.
+
+        Returns:
+            tuple(str,str), the (stdout, stderr) of the last compilation
+                of the same code, or None if it was not compiled recently.
+        """
+        key = self._cache_key(text)
+        with GccManager._results_lock:
+            result = GccManager._results.get(key)
+            if result is not None:
+                GccManager._results.move_to_end(key)
+
+        return result
+
+    def cache_result(self,text,result):
+        """Keep the (stdout, stderr) result of compiling the given code."""
+        key = self._cache_key(text)
+        with GccManager._results_lock:
+            GccManager._results[key] = result
+            GccManager._results.move_to_end(key)
+            if len(GccManager._results) > CACHE_SIZE:
+                GccManager._results.popitem(last=False)
+
     def compile_raw_code(self,text):
-        
-        with tempfile.TemporaryDirectory() as dir_path:
-            file_path = os.path.join(dir_path,'temp.c')
-
-            with open(file_path,'w') as file:
-                file.write(text)
-                file.seek(0)
-
-                command = 'gcc %s' % file_path
-                process = subprocess.run(
-                    args=command,
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE, 
-                    shell=True, 
-                    universal_newlines=True
-                )
-
-                return process.stdout, process.stderr
\ No newline at end of file
+
+        result = self.get_cached_result(text)
+        if result is not None:
+            return result
+
+        # A timeout depends on the load of the machine, not on the code,
+        # so it is not cached and the code is compiled again next time
+        try:
+            result = self._compile(text)
+        except subprocess.TimeoutExpired:
+            return '', 'gcc took more than %d seconds to compile the code.\n' % GCC_TIMEOUT
+
+        self.cache_result(text,result)
+
+        return result
+
+    def _compile(self,text):
+
+        if INDEX is not None:
+            return libclang_syntax_check(text)
+
+        if self._pool is not None:
+            with tempfile.TemporaryDirectory(dir=TEMP_DIR) as dir_path:
+                file_path = os.path.join(dir_path,'temp.c')
+
+                with open(file_path,'w') as file:
+                    file.write(text)
+
+                return self._pool.compile_file(file_path)
+
+        # The code is given to gcc through its standard input, so
+        # no file needs to be written
+        process = run_gcc(
+            ['gcc'] + list(self._flags) + ['-pipe','-x','c','-'],
+            input=text
+        )
+
+        return process.stdout, process.stderr
+
+    def submit(self,text):
+        """Compile the given code in a batch shared with other requests.
+
+        Args:
+            text (str): The C source code to be compiled.
+
+        Returns:
+            concurrent.futures.Future, resolves to a (stdout, stderr) tuple.
+        """
+        # There is no process startup to amortize when libclang is used
+        if INDEX is not None:
+            future = Future()
+            future.set_result(self.compile_raw_code(text))
+            return future
+
+        with GccManager._batches_lock:
+            batch = GccManager._batches.get(self._flags)
+            if batch is None:
+                batch = GccBatch(self._flags)
+                GccManager._batches[self._flags] = batch
+
+        return batch.submit(text)
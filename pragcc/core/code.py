@@ -3,7 +3,7 @@
 import os
 import shutil
 import tempfile
-from .parser.c99 import parser
+from .parser.c99 import parser, tsparser
 
 
 class CCode(object):
@@ -20,12 +20,21 @@ class CCode(object):
         return new_file_path
 
     @staticmethod
-    def load_data_from_file(file_path):
-        code_data = parser.get_data_from_cfile(file_path)
+    def load_data_from_file(file_path,use_tree_sitter=False):
+        code_data = None
+
+        # Tree-sitter gives up on the code it can not handle,
+        # in that case pycparser is used.
+        if use_tree_sitter:
+            code_data = tsparser.get_data_from_cfile(file_path)
+
+        if code_data is None:
+            code_data = parser.get_data_from_cfile(file_path)
+
         return code_data
 
     @staticmethod
-    def load_data_from_text(text):
+    def load_data_from_text(text,use_tree_sitter=False):
         with tempfile.TemporaryDirectory() as dir_path:
             file_path = os.path.join(dir_path,'temp.c')
 
@@ -33,19 +42,24 @@ class CCode(object):
                 file.write(text)
                 file.seek(0)
 
-            return CCode.load_data_from_file(file_path)
+            return CCode.load_data_from_file(file_path,use_tree_sitter)
 
 
-    def __init__(self,file_suffix='ccode_',file_path=None,raw_code=None):
+    def __init__(self,file_suffix='ccode_',file_path=None,raw_code=None,
+        use_tree_sitter=False):
 
         self._file_path = file_path
         self._raw_code = raw_code
+        self._use_tree_sitter = use_tree_sitter
 
         if file_path and not raw_code:
             copied_file_path = CCode.copy_file(file_path,file_suffix)
-            self._data = CCode.load_data_from_file(copied_file_path)
+            self._data = CCode.load_data_from_file(
+                copied_file_path,
+                use_tree_sitter
+            )
         elif raw_code and not file_path:
-            self._data = CCode.load_data_from_text(raw_code)
+            self._data = CCode.load_data_from_text(raw_code,use_tree_sitter)
         else:
             # When this happend we need to raise and exception
             # The data dict can't be None
@@ -134,9 +148,15 @@ class CCode(object):
             file.write(new_raw_data)
         
         if self._file_path:
-            self._data = CCode.load_data_from_file(self._file_path)
+            self._data = CCode.load_data_from_file(
+                self._file_path,
+                self._use_tree_sitter
+            )
         elif self._raw_code:
-            self._data = CCode.load_data_from_text(self._raw_code)
+            self._data = CCode.load_data_from_text(
+                self._raw_code,
+                self._use_tree_sitter
+            )
         else:
             raise ValueError(
                 """file_path or raw_code kwargs any of these 
@@ -1,10 +1,35 @@
 # -*- encoding: utf-8 -*-
 
 import os
+import copy
 import yaml
 import shutil
+import functools
 from . import settings
 
+
+YAML_LOADER = getattr(yaml,'CSafeLoader',yaml.SafeLoader)
+"""yaml.Loader: The libyaml based loader if PyYAML was built with it,
+otherwise the pure Python one.
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_file(file_path,mtime):
+    """Load a YAML file only once while it is not modified.
+
+    Args:
+        file_path (str): Path to the YAML file.
+        mtime (int): Last modification time of the file in nanoseconds,
+            a modified file is loaded again.
+
+    Returns:
+        dict, shared by every call, it must not be modified.
+    """
+    with open(file_path,'r') as file:
+        return yaml.load(file,Loader=YAML_LOADER)
+
+
 class Parallel(object):
 
     OPEN_MP = 'mp'
@@ -15,14 +40,14 @@ class Parallel(object):
 
     @staticmethod
     def _load_from_text(text):
-        data = yaml.load(text)
+        data = yaml.load(text,Loader=YAML_LOADER)
         return data
 
     @staticmethod
     def _load_from_file(file_path):
-        with open(file_path,'r') as file:
-            data = yaml.load(file)
-            return data
+        mtime = os.stat(file_path).st_mtime_ns
+        data = _load_yaml_file(file_path,mtime)
+        return copy.deepcopy(data)
 
     @staticmethod
     def is_block_directive(directive_name):
@@ -1,7 +1,138 @@
 # -*- encoding: utf-8 -*-
 
+import io
+import os
+import re
+import copy
+import functools
+
 from . import code
 from . import metadata
+from .parser.c99 import tsparser
+from .parser.c99.pycparser.plyparser import ParseError
+
+
+NEWLINE = re.compile('\n')
+"""re.Pattern: Line separator, as counted by the parser line numbers."""
+
+
+@functools.lru_cache(maxsize=32)
+def _load_code_from_file(file_suffix,file_path,mtime,use_tree_sitter):
+    """Parse a C99 source file only once while it is not modified.
+
+    Args:
+        file_suffix (str): Prefix of the copy of the file to be parsed.
+        file_path (str): A unique path to the file to be parallelized.
+        mtime (int): Last modification time of the file in nanoseconds,
+            a modified file is parsed again.
+        use_tree_sitter (bool): Try to parse the file with tree-sitter.
+
+    Returns:
+        code.CCode, shared by every call, it must not be modified.
+    """
+    return code.CCode(
+        file_suffix=file_suffix,
+        file_path=file_path,
+        use_tree_sitter=use_tree_sitter
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _load_code_from_text(raw_code,use_tree_sitter):
+    """Parse a C99 raw code only once while it is requested often.
+
+    Api clients send the same code again and again, for example to
+    annotate it with different parallel files, so it is parsed once.
+
+    Args:
+        raw_code (str): The raw code to be parallelized.
+        use_tree_sitter (bool): Try to parse the code with tree-sitter.
+
+    Returns:
+        code.CCode, shared by every call, it must not be modified.
+    """
+    return code.CCode(raw_code=raw_code,use_tree_sitter=use_tree_sitter)
+
+
+def load_code(file_suffix,file_path=None,raw_code=None,use_tree_sitter=False):
+    """Return the code.CCode object of the code to be parallelized.
+
+    Parallelizers modify the code they hold, so each one gets its
+    own copy of the cached code.
+
+    Args:
+        file_suffix (str): Prefix of the copy of the file to be parsed.
+        file_path (Optional[str]): A unique path to the file to be parallelized.
+        raw_code (Optional[str]): The raw code to be parallelized.
+        use_tree_sitter (bool): Try to parse the code with tree-sitter
+            before using pycparser.
+
+    Returns:
+        code.CCode, an instance that contains the information about the ccode.
+    """
+    # Without tree-sitter both ways use pycparser, they share the cache
+    use_tree_sitter = use_tree_sitter and tsparser.AVAILABLE
+
+    if file_path and not raw_code:
+        mtime = os.stat(file_path).st_mtime_ns
+        ccode = _load_code_from_file(
+            file_suffix,
+            file_path,
+            mtime,
+            use_tree_sitter
+        )
+        return copy.deepcopy(ccode)
+
+    if raw_code and not file_path:
+        ccode = _load_code_from_text(raw_code,use_tree_sitter)
+        return copy.deepcopy(ccode)
+
+    return code.CCode(
+        file_suffix=file_suffix,
+        file_path=file_path,
+        raw_code=raw_code,
+        use_tree_sitter=use_tree_sitter
+    )
+
+
+def preload_code(raw_code):
+    """Parse a raw code before it is given to the parallelizers.
+
+    Api clients check that their code compiles before asking for it to
+    be parallelized, so the code is parsed after it compiles and the 
+    OpenMP and OpenACC parallelizers find it already parsed.
+
+    Args:
+        raw_code (str): The raw code that will be parallelized.
+    """
+    # OpenMP tries tree-sitter first, OpenACC uses pycparser
+    ways = [True,False] if tsparser.AVAILABLE else [False]
+
+    for use_tree_sitter in ways:
+        try:
+            _load_code_from_text(raw_code,use_tree_sitter)
+        except (ParseError,IndexError,ValueError):
+            # The parallelizer will report the error when it is used
+            return
+
+
+PRAGMA_TEMPLATE = '#pragma {library_name} {directive_name} {clauses}'
+"""str: Template of a raw pragma with its clauses."""
+
+PRAGMA_TEMPLATES = {
+    ('omp','parallel'): '#pragma omp parallel {clauses}',
+    ('omp','parallel for'): '#pragma omp parallel for {clauses}',
+    ('omp','for'): '#pragma omp for {clauses}',
+    ('acc','data'): '#pragma acc data {clauses}',
+    ('acc','parallel'): '#pragma acc parallel {clauses}',
+    ('acc','kernels'): '#pragma acc kernels {clauses}',
+    ('acc','parallel loop'): '#pragma acc parallel loop {clauses}',
+    ('acc','loop'): '#pragma acc loop {clauses}',
+}
+"""dict: Templates of the supported directives, by library and directive
+name, other directives are created with *PRAGMA_TEMPLATE*.
+"""
+
 
 class DirectiveFactory(object):
     """Deals with OpenMP and OpenACC raw pragmas creation."""
@@ -19,36 +150,39 @@ class DirectiveFactory(object):
         Returns: 
             A raw pragma.
         """
-        raw_pragma = '#pragma %s %s %s'
-        raw_clauses = ''
+        raw_clauses = []
 
         for clause_name, value in clauses.items():
-            raw_clauses += clause_name
 
             # Clause with no arguments
             if value is None:
-                raw_clauses += ' '
+                raw_clauses.append(clause_name + ' ')
+                continue
 
             # Clause witha list of arguments string
-            elif type(value) is list:
-                raw_clauses += '(' + ','.join(value) + ') '
+            if type(value) is list:
+                value = ','.join(value)
 
-            # Clause with a single argument int
-            elif type(value) is int:
-                raw_clauses += '(' + str(value) + ') '
+            # Clause with a single argument, int or string
+            raw_clauses.append('%s(%s) ' % (clause_name,value))
 
-            # Clause with a single argument string
-            else:
-                raw_clauses += '(' + value + ') '
+        template = PRAGMA_TEMPLATES.get(
+            (library_name,directive_name),
+            PRAGMA_TEMPLATE
+        )
 
-        return raw_pragma % (library_name,directive_name,raw_clauses)
+        return template.format_map({
+            'library_name': library_name,
+            'directive_name': directive_name,
+            'clauses': ''.join(raw_clauses)
+        })
 
 
 class BaseParallelizer(object):
     """Define a set of functions required on each paralelization method."""
 
     @staticmethod
-    def insert_lines(raw,insertions=[]):
+    def insert_lines(raw,insertions=[],lines=None):
         """Given a raw string, perfonms a set of insertions on it.
 
         Args:
@@ -56,27 +190,53 @@ class BaseParallelizer(object):
                 must be performed.
             insertions (List[tuple(str,int,int)]): A list of directives 
                 to be inserted in the given section of raw code.
+            lines (Optional[List[str]]): raw splitted on newlines, if the
+                caller already has it, so raw is not scanned again.
 
         Returns:
             str, a raw string with some insertions performed on it.
         """
-        lines = raw.splitlines()
-        numbered_lines = list(enumerate(lines))
-        fake_line = -1
+        # Nothing can be inserted in an empty raw or before its first
+        # line, it is known without looking at the lines
+        if not raw or min((line for _, line in insertions),default=0) < 0:
+            return ''
+
+        # Where each line begins in raw, lines are not copied
+        if lines is not None:
+            offsets = [0]
+            for line in lines[:-1]:
+                offsets.append(offsets[-1] + len(line) + 1)
+        else:
+            offsets = [0] + [newline.end() for newline in NEWLINE.finditer(raw)]
+
+        lines_count = len(offsets) if offsets[-1] < len(raw) else len(offsets) - 1
+
+        # If any insertion has an invalid position no insertions are
+        # performed at all
+        for new_raw, insertion_line in insertions:
+            if not 0 <= insertion_line < lines_count:
+                return ''
 
-        new_numbered_lines = []
+        # Insertions on the same line keep the order they were given in
+        line_insertions = {}
         for new_raw, insertion_line in insertions:
-            for list_index, code in enumerate(numbered_lines):
-                line_in_code = code[0]
-                if line_in_code is insertion_line:
-                    new_numbered_lines += numbered_lines[:list_index]
-                    new_numbered_lines += [(fake_line,new_raw)]
-                    new_numbered_lines += numbered_lines[list_index:]
+            line_insertions.setdefault(insertion_line,[]).append(new_raw)
+
+        # Only the pieces of raw between insertions are copied, the 
+        # newline ending raw is left out as lines are joined by newlines
+        end = len(raw) - 1 if raw.endswith('\n') else len(raw)
+        new_raw_code = io.StringIO()
+        position = 0
+        for insertion_line in sorted(line_insertions):
+            offset = offsets[insertion_line]
+            new_raw_code.write(raw[position:offset])
+            for new_raw in line_insertions[insertion_line]:
+                new_raw_code.write(new_raw + '\n')
+            position = offset
 
-            numbered_lines = new_numbered_lines
-            new_numbered_lines = []
+        new_raw_code.write(raw[position:end])
 
-        return '\n'.join([code[1] for code in numbered_lines])
+        return new_raw_code.getvalue()
 
     def get_raw_pragma(self,directive_name,clauses):
         """Returns a raw pragma with its clausules.
@@ -133,10 +293,13 @@ class OpenMP(BaseParallelizer):
         super(OpenMP,self).__init__()
 
         #: code.CCode: An instance that contains the information about the ccode.
-        self._code = code.CCode(
+        #: Tree-sitter parses the code when it is available, it does not need
+        #: the fake headers pycparser relies on.
+        self._code = load_code(
             file_suffix='mp_',
             file_path=file_path,
-            raw_code=raw_code
+            raw_code=raw_code,
+            use_tree_sitter=True
         )
 
         #: DirectiveFactory: To create OpenMP raw pragmas.
@@ -374,7 +537,7 @@ class OpenACC(BaseParallelizer):
         super(OpenACC,self).__init__()
 
         #: code.CCode: An instance that contains the information about the ccode.
-        self._code = code.CCode(
+        self._code = load_code(
             file_suffix='mp_',
             file_path=file_path,
             raw_code=raw_code
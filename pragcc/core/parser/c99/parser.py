@@ -10,8 +10,10 @@ the original one.
 """
 
 import os
+import re
 from . import ast_visitor
 from . import pycparser
+from .pycparser.plyparser import ParseError
 
 
 FAKE_DEFINES = '#include <_fake_defines.h>'
@@ -52,6 +54,49 @@ The docstring may span multiple lines. The type may optionally be specified
 on the first line, separated by a colon.
 """
 
+COMMENTS_AND_STRINGS = re.compile(r'/\*.*?\*/|//[^\n]*|"(?:\\.|[^"\\\n])*"',re.DOTALL)
+"""re.Pattern: Comments and string literals, the words on them are not code."""
+
+
+def check_fake_typedefs(file_path):
+    """Check that the bool type will be known by the parser.
+
+    *fake_cfile* replaces the second include of the code with *FAKE_TYPEDEFS*,
+    where bool is defined, and removes the others, stdbool.h included. So
+    a code with less than two includes can not use bool, unless the code
+    defines it. In that case the parsing would fail, so it fails here 
+    without preprocessing and parsing the code.
+
+    Only the use of bool as the type of a declaration, like *bool value*,
+    is rejected here, bool may also be the name of a variable or a field.
+
+    Args:
+        file_path (str): Path to the C99 source code file to be checked.
+
+    Raises:
+        ParseError: If the code declares something of the bool type and it
+            will not be defined.
+    """
+    with open(file_path,'r') as file:
+        lines = file.readlines()
+
+    # Includes are counted the same way fake_cfile finds them
+    includes = [line for line in lines if '#include' in line]
+    if len(includes) >= 2:
+        return
+
+    code = COMMENTS_AND_STRINGS.sub(' ',''.join(lines))
+    if not re.search(r'\bbool\s+[A-Za-z_]',code):
+        return
+
+    typedef = r'\btypedef\b[^;]*\bbool\b|#\s*define\s+bool\b'
+    if not re.search(typedef,code):
+        raise ParseError(
+            '%s: the type bool is unknown, two includes must be placed '
+            'before it is used.' % file_path
+        )
+
+
 def fake_cfile(file_path):
     """Include fake include header with the basic C99 type definitions.
     To parce a C99 source code it is not neccesary to get the whole
@@ -105,6 +150,7 @@ def parse_cfile(file_path,preprocesor='cpp'):
     Returns:
         A Syntrax Abstract Tree.
     """
+    check_fake_typedefs(file_path=file_path)
     faked_file_path = fake_cfile(file_path=file_path)
 
     ast = pycparser.parse_file(filename=faked_file_path,use_cpp=True,
@@ -160,7 +206,21 @@ def get_data_from_cfile(file_path,compiler='gcc'):
     visitor = ast_visitor.FuncDefVisitor()
     funcdefs = visitor.funcdefs(code_ast)
     fundefs_data = visitor.funcdefs_data(funcdefs)
-    
+
+    return split_cfile(file_path,fundefs_data)
+
+
+def split_cfile(file_path,fundefs_data):
+    """Split a C99 source code in sections given its functions data.
+
+    Args:
+        file_path (str): The path to the C99 source file to be splitted.
+        fundefs_data (List[dict]): The data of each function in the
+            code, as given by ast_visitor.FuncDefVisitor.funcdefs_data.
+
+    Returns:
+        dict: a dict containing the sections of the C99 source code.
+    """
     code_data = {}
 
     with open(file_path,'r') as file:
@@ -0,0 +1,179 @@
+# -*- encoding: utf-8 -*-
+"""Tree-sitter Parser Module.
+This module parses C99 source code with tree-sitter-c, a parser written
+in C that works on the source code as it is, so the fake headers needed
+by pycparser are not required. The tree-sitter syntax tree is adapted to
+the pycparser nodes used by the ast_visitor module, so the data extracted
+from the code is the same one given by the parser module.
+
+Tree-sitter is optional, if the tree_sitter_languages package is not
+installed or the code has constructs that are not handled here, the
+functions of this module return None and pycparser must be used.
+"""
+
+from . import ast_visitor
+from . import parser
+from .pycparser import c_ast
+from .pycparser.plyparser import Coord
+
+try:
+    from tree_sitter_languages import get_parser
+    # Some tree_sitter versions can not load the bundled languages
+    get_parser('c')
+except Exception:
+    get_parser = None
+
+
+AVAILABLE = get_parser is not None
+"""bool: True if the tree_sitter_languages package can be used."""
+
+UNSUPPORTED_NODES = ['preproc_if','preproc_ifdef','preproc_elif','preproc_else']
+"""List[str]: Conditional compilation nodes, the code they enclose
+depends on the C preprocessor, so if any of them is present anywhere
+the code is not parsed here.
+"""
+
+
+class UnsupportedCode(Exception):
+    """Raised when the code has nodes that are not handled here."""
+
+
+def _coord(file_path,point):
+    return Coord(file_path,point[0] + 1,point[1] + 1)
+
+
+def _function_name(declarator):
+    while declarator.type != 'identifier':
+        declarator = declarator.child_by_field_name('declarator')
+        if declarator is None:
+            return None
+
+    return declarator.text.decode()
+
+
+def _for_loops(file_path,node):
+    """Return the outermost for loops inside the given node as
+    pycparser.c_ast.For objects.
+    """
+    loops = []
+    for child in node.children:
+        if child.type in UNSUPPORTED_NODES:
+            raise UnsupportedCode(child.type)
+
+        if child.type == 'for_statement':
+            loops.append(_for_loop(file_path,child))
+        else:
+            loops += _for_loops(file_path,child)
+
+    return loops
+
+
+def _for_loop(file_path,node):
+    """Adapt a for_statement node to a pycparser.c_ast.For object.
+
+    Only the body of the loop is kept, it is a pycparser.c_ast.Compound
+    when it is enclosed in braces, so the loop ends where the braces end,
+    otherwise the loop ends in the line where it begins.
+    """
+    body = node.child_by_field_name('body')
+    coord = _coord(file_path,node.start_point)
+
+    if body.type == 'compound_statement':
+        stmt = c_ast.Compound(
+            block_items=_for_loops(file_path,body),
+            coord=_coord(file_path,body.start_point),
+            end_coord=_coord(file_path,body.end_point)
+        )
+    elif body.type == 'for_statement':
+        stmt = _for_loop(file_path,body)
+    else:
+        stmt = c_ast.ExprList(exprs=_for_loops(file_path,body),coord=coord)
+
+    return c_ast.For(init=None,cond=None,next=None,stmt=stmt,coord=coord)
+
+
+def _funcdef(file_path,node):
+    """Adapt a function_definition node to a pycparser.c_ast.FuncDef object."""
+    declarator = node.child_by_field_name('declarator')
+    body = node.child_by_field_name('body')
+    name = _function_name(declarator)
+
+    if name is None:
+        return None
+
+    decl = c_ast.Decl(
+        name=name,
+        quals=[],
+        storage=[],
+        funcspec=[],
+        type=None,
+        init=None,
+        bitsize=None,
+        coord=_coord(file_path,declarator.start_point)
+    )
+
+    try:
+        block_items = _for_loops(file_path,body)
+    except UnsupportedCode:
+        return None
+
+    body = c_ast.Compound(
+        block_items=block_items,
+        coord=_coord(file_path,body.start_point),
+        end_coord=_coord(file_path,body.end_point)
+    )
+
+    return c_ast.FuncDef(decl=decl,param_decls=None,body=body)
+
+
+def parse_cfile(file_path):
+    """Parse a C99 source code into pycparser function definitions.
+
+    Args:
+        file_path (str): Path to the file to be parsed.
+
+    Returns:
+        List[pycparser.c_ast.FuncDef], or None if the code can not be
+            parsed with tree-sitter.
+    """
+    if not AVAILABLE:
+        return None
+
+    with open(file_path,'rb') as file:
+        tree = get_parser('c').parse(file.read())
+
+    root = tree.root_node
+    if root.has_error:
+        return None
+
+    funcdefs = []
+    for node in root.children:
+        if node.type in UNSUPPORTED_NODES:
+            return None
+
+        if node.type == 'function_definition':
+            funcdef = _funcdef(file_path,node)
+            if funcdef is None:
+                return None
+            funcdefs.append(funcdef)
+
+    return funcdefs
+
+
+def get_data_from_cfile(file_path):
+    """Split a C99 source code in sections using tree-sitter.
+
+    Args:
+        file_path (str): The path to the C99 source file to be parsed.
+
+    Returns:
+        dict: the same sections given by parser.get_data_from_cfile, or
+            None if the code can not be parsed with tree-sitter.
+    """
+    funcdefs = parse_cfile(file_path)
+    if funcdefs is None:
+        return None
+
+    fundefs_data = ast_visitor.FuncDefVisitor.funcdefs_data(funcdefs)
+
+    return parser.split_cfile(file_path,fundefs_data)
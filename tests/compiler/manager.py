@@ -0,0 +1,168 @@
+# -*- encoding: utf-8 -*-
+
+from compiler import manager
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestGccManager(unittest.TestCase):
+
+    def setUp(self):
+        # Each test compiles its codes, no result comes from other tests
+        manager.GccManager._results.clear()
+
+        # Codes checked on their own are given to gcc through its stdin
+        self._workers = mock.patch.object(manager,'GCC_WORKERS',0)
+        self._workers.start()
+
+        self._manager = manager.GccManager()
+
+    def tearDown(self):
+        self._workers.stop()
+
+    def test_batch_routes_warnings_to_their_code(self):
+        """
+        Codes submitted together are checked by the same gcc process,
+        so the warnings are reported against the batch file names.
+        """
+        future_1 = self._manager.submit('int a;\n')
+        future_2 = self._manager.submit('#warning second\nint b;\n')
+
+        stdout_1, stderr_1 = future_1.result(timeout=30)
+        stdout_2, stderr_2 = future_2.result(timeout=30)
+
+        self.assertEqual(stderr_1,'')
+        self.assertIn('snippet_1.c',stderr_2)
+        self.assertIn('second',stderr_2)
+
+    def test_snippet_names_in_the_code_do_not_route_warnings(self):
+        """
+        The source lines echoed by gcc are not taken as the name of the 
+        file a warning belongs to, even if they look like one.
+        """
+        future_1 = self._manager.submit('#warning snippet_1.c: SECRET\n')
+        future_2 = self._manager.submit('int victim;\n')
+        future_3 = self._manager.submit('#warning snippet_99.c:\n')
+
+        stdout_1, stderr_1 = future_1.result(timeout=30)
+        stdout_2, stderr_2 = future_2.result(timeout=30)
+        stdout_3, stderr_3 = future_3.result(timeout=30)
+
+        self.assertIn('SECRET',stderr_1)
+        self.assertEqual(stderr_2,'')
+        self.assertIn('snippet_99.c',stderr_3)
+
+    def test_snippets_including_each_other_are_compiled_on_their_own(self):
+        """Warnings that can not be routed with certainty are not used."""
+        batch = manager.GccBatch(manager.GCC_FLAGS)
+        stderr = (
+            'In file included from /tmp/batch/snippet_0.c:1:\n'
+            '/tmp/batch/snippet_1.c:1:2: warning: #warning second\n'
+        )
+
+        self.assertIsNone(batch._route('/tmp/batch',stderr,2))
+        self.assertIsNone(batch._route('/tmp/batch','cc1: warning: flag\n',2))
+
+    def test_failed_batch_compiles_each_code(self):
+        """
+        When a code of the batch does not compile, each code is compiled
+        again on its own, so errors are not reported to the other codes.
+        """
+        future_1 = self._manager.submit('int a = ;\n')
+        future_2 = self._manager.submit('int b;\n')
+
+        stdout_1, stderr_1 = future_1.result(timeout=30)
+        stdout_2, stderr_2 = future_2.result(timeout=30)
+
+        self.assertIn('error',stderr_1)
+        self.assertNotIn('snippet_',stderr_1)
+        self.assertEqual(stderr_2,'')
+
+    def test_cached_result(self):
+        """A code compiled recently is not given to gcc again."""
+        result = self._manager.compile_raw_code('int a = ;\n')
+
+        with mock.patch.object(manager,'run_gcc') as run_gcc:
+            cached_result = self._manager.compile_raw_code('int a = ;\n')
+            run_gcc.assert_not_called()
+
+        self.assertEqual(cached_result,result)
+        self.assertEqual(self._manager.get_cached_result('int a = ;\n'),result)
+
+    def test_timeout_is_not_cached(self):
+        """A code that timed out is given to gcc again the next time."""
+        timeout = manager.subprocess.TimeoutExpired('gcc',manager.GCC_TIMEOUT)
+        with mock.patch.object(manager,'run_gcc',side_effect=timeout):
+            stdout, stderr = self._manager.compile_raw_code('int a;\n')
+
+        self.assertIn('seconds',stderr)
+        self.assertIsNone(self._manager.get_cached_result('int a;\n'))
+        self.assertEqual(self._manager.compile_raw_code('int a;\n'),('',''))
+
+    def test_slow_code_does_not_block_the_batch(self):
+        """
+        A code that makes gcc wait, here for a writer of the fifo it 
+        includes, gets a timeout error, the codes in its batch and the
+        following ones still get their own results.
+        """
+        with tempfile.TemporaryDirectory() as dir_path:
+            fifo_path = os.path.join(dir_path,'fifo.h')
+            os.mkfifo(fifo_path)
+
+            with mock.patch.object(manager,'GCC_TIMEOUT',1):
+                slow_future = self._manager.submit('#include "%s"\n' % fifo_path)
+                future = self._manager.submit('int a;\n')
+
+                stdout, stderr = future.result(timeout=30)
+                slow_stdout, slow_stderr = slow_future.result(timeout=30)
+
+                next_future = self._manager.submit('int b;\n')
+                next_stdout, next_stderr = next_future.result(timeout=30)
+
+        self.assertEqual(stderr,'')
+        self.assertIn('seconds',slow_stderr)
+        self.assertEqual(next_stderr,'')
+
+    def test_stuck_worker_is_replaced(self):
+        """
+        A worker of the pool that takes too long is killed and replaced,
+        so the pool can still check the following codes.
+        """
+        pool = manager.GccPool(manager.GCC_FLAGS,1)
+        self.addCleanup(pool.close)
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            fifo_path = os.path.join(dir_path,'fifo.h')
+            os.mkfifo(fifo_path)
+
+            slow_path = os.path.join(dir_path,'slow.c')
+            with open(slow_path,'w') as file:
+                file.write('#include "%s"\n' % fifo_path)
+
+            path = os.path.join(dir_path,'code.c')
+            with open(path,'w') as file:
+                file.write('int a = ;\n')
+
+            with mock.patch.object(manager,'GCC_TIMEOUT',1):
+                with self.assertRaises(manager.subprocess.TimeoutExpired):
+                    pool.compile_file(slow_path)
+
+                stdout, stderr = pool.compile_file(path)
+
+        self.assertIn('error',stderr)
+
+    def test_worker_checks_code_without_diagnostics(self):
+        """The deadline of a check is not reached once gcc is done."""
+        pool = manager.GccPool(manager.GCC_FLAGS,1)
+        self.addCleanup(pool.close)
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            path = os.path.join(dir_path,'code.c')
+            with open(path,'w') as file:
+                file.write('int a;\n')
+
+            self.assertEqual(pool.compile_file(path),('',''))
+            self.assertEqual(pool.compile_file(path),('',''))
@@ -6,21 +6,31 @@ from pragcc.core.parser.c99.pycparser.plyparser import ParseError
 from tests import utils
 from tests.pragcc import test_data
 
+import shutil
+import tempfile
 import unittest
 
 class TestCCodeObject(unittest.TestCase):
 
-    def setUp(self):
-        self._basic = test_data.BASIC_FILE_PATH
-        self._complex = test_data.COMPLEX_FILE_PATH
-        self._empty = test_data.EMPTY_FILE_PATH
-        self._unsupported_1 = test_data.UNSUPPORTED_CODE_FILE_PATH_1
-        self._unsupported_2 = test_data.UNSUPPORTED_CODE_FILE_PATH_2
-        self._supported = test_data.SUPPORTED_CODE_FILE_PATH
-
-    def tearDown(self):
-        utils.purge(dir=test_data.TEST_DIR,pattern=r'^fake_*')
-        utils.purge(dir=test_data.TEST_DIR,pattern=r'^ccode_*')
+    @classmethod
+    def setUpClass(cls):
+
+        # Parsing writes fake_* files next to the parsed file, so the
+        # tests of this class parse their own copies
+        cls._dir = tempfile.mkdtemp()
+
+        cls._basic = utils.copy_file(cls._dir,test_data.BASIC_FILE_PATH)
+        cls._complex = utils.copy_file(cls._dir,test_data.COMPLEX_FILE_PATH)
+        cls._empty = utils.copy_file(cls._dir,test_data.EMPTY_FILE_PATH)
+        cls._unsupported_1 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_1)
+        cls._unsupported_2 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_2)
+        cls._supported = utils.copy_file(cls._dir,test_data.SUPPORTED_CODE_FILE_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        # Clean the copies and the intermediate files created while parsing
+        shutil.rmtree(cls._dir)
     
     def test_read_basic_code_from_file(self):
         """
@@ -15,4 +15,14 @@ class TestParallelFile(unittest.TestCase):
 	def test_parallel_metadata_object_creation(self):
 		parallel_metadata = metadata.Parallel(file_path=self._file_path_1)
 		self.assertIsInstance(parallel_metadata,metadata.Parallel)
-		self.assertIsInstance(parallel_metadata.data,dict)
\ No newline at end of file
+		self.assertIsInstance(parallel_metadata.data,dict)
+
+	def test_parallel_metadata_objects_from_the_same_file(self):
+		"""
+			The parsed file is cached, but each Parallel object must be
+			able to change its data without changing the data of the others.
+		"""
+		parallel_metadata_1 = metadata.Parallel(file_path=self._file_path_1)
+		parallel_metadata_2 = metadata.Parallel(file_path=self._file_path_1)
+		parallel_metadata_1.data.clear()
+		self.assertTrue(parallel_metadata_2.data)
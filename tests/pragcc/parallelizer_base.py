@@ -53,8 +53,9 @@ class TestBaseParallelizer(unittest.TestCase):
             insertions
         )
 
-        line_1 = new_raw.splitlines()[1]
-        line_2 = new_raw.splitlines()[3]
+        new_lines = new_raw.splitlines()
+        line_1 = new_lines[1]
+        line_2 = new_lines[3]
 
         self.assertEqual(line_1,'First insertion')
         self.assertEqual(line_2,'Second insertion')
@@ -101,6 +102,73 @@ class TestBaseParallelizer(unittest.TestCase):
 
         self.assertEqual(new_raw,'')
 
+    def test_insert_lines_in_the_same_position(self):
+        """ 
+        Insertions sharing a position are placed in the order
+        they were given, before the line at that position.
+        """
+
+        insertions = [
+            ('First insertion',2),
+            ('Second insertion',2)
+        ]
+
+        new_raw = self._parallelizer.insert_lines(
+            self._raw_code,
+            insertions
+        )
+
+        new_lines = new_raw.splitlines()
+
+        self.assertEqual(new_lines[2],'First insertion')
+        self.assertEqual(new_lines[3],'Second insertion')
+        self.assertEqual(new_lines[4],'    for(int i; i < 10; ++i){')
+
+    def test_insert_lines_in_a_long_raw_code(self):
+        """ 
+        Positions are compared by value, so insertions work on
+        any line of a long raw code.
+        """
+
+        long_raw = '\n'.join(str(line) for line in range(1000))
+
+        insertions = [
+            ('First insertion',500)
+        ]
+
+        new_raw = self._parallelizer.insert_lines(
+            long_raw,
+            insertions
+        )
+
+        new_lines = new_raw.splitlines()
+
+        self.assertEqual(len(new_lines),1001)
+        self.assertEqual(new_lines[500],'First insertion')
+        self.assertEqual(new_lines[501],'500')
+
+    def test_insert_lines_in_splitted_raw_code(self):
+        """ 
+        The lines of the raw code can be given to avoid scanning
+        it again, the result is the same.
+        """
+
+        insertions = [
+            ('First insertion',1),
+            ('Second insertion',2)
+        ]
+
+        for raw in [self._raw_code,self._raw_code + '\n']:
+            new_raw = self._parallelizer.insert_lines(
+                raw,
+                insertions,
+                lines=raw.split('\n')
+            )
+
+            expected_raw = self._parallelizer.insert_lines(raw,insertions)
+
+            self.assertEqual(new_raw,expected_raw)
+
     def test_insert_in_an_empty_string(self):
         """ 
             Inserting code in and empty string. 
@@ -50,3 +50,32 @@ class TestDirectiveFactory(unittest.TestCase):
         expected_pragma = '#pragma omp parallel '
 
         self.assertTrue(pragmas_equals(pragma,expected_pragma))
+
+    def test_create_open_acc_directive_with_clauses_of_each_type(self):
+
+        pragma = self._directive_factory.create_raw_pragma(
+            library_name='acc',
+            directive_name='parallel loop',
+            clauses={
+                'gang': None,
+                'num_gangs': 100,
+                'copy': ['A','B'],
+                'reduction': '+:sum'
+            }
+        )
+
+        expected_pragma = '#pragma acc parallel loop gang num_gangs(100) copy(A,B) reduction(+:sum) '
+
+        self.assertTrue(pragmas_equals(pragma,expected_pragma))
+
+    def test_create_directive_without_template(self):
+
+        pragma = self._directive_factory.create_raw_pragma(
+            library_name='omp',
+            directive_name='single',
+            clauses={'nowait': None}
+        )
+
+        expected_pragma = '#pragma omp single nowait '
+
+        self.assertTrue(pragmas_equals(pragma,expected_pragma))
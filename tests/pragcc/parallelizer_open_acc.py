@@ -6,27 +6,32 @@ from pragcc.core.parser.c99.pycparser.plyparser import ParseError
 from tests import utils
 from tests.pragcc import test_data
 
+import shutil
+import tempfile
 import unittest
 
 
 class TestOpenACCObject(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+
+        # Parsing writes fake_* files next to the parsed file, so the
+        # tests of this class parse their own copies
+        cls._dir = tempfile.mkdtemp()
 
-        # Set of files to test code annotation with OpenMP directives
-        self._basic = test_data.BASIC_FILE_PATH
-        self._complex = test_data.COMPLEX_FILE_PATH
-        self._empty = test_data.EMPTY_FILE_PATH
-        self._unsupported_1 = test_data.UNSUPPORTED_CODE_FILE_PATH_1
-        self._unsupported_2 = test_data.UNSUPPORTED_CODE_FILE_PATH_2
-        self._supported = test_data.SUPPORTED_CODE_FILE_PATH
+        cls._basic = utils.copy_file(cls._dir,test_data.BASIC_FILE_PATH)
+        cls._complex = utils.copy_file(cls._dir,test_data.COMPLEX_FILE_PATH)
+        cls._empty = utils.copy_file(cls._dir,test_data.EMPTY_FILE_PATH)
+        cls._unsupported_1 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_1)
+        cls._unsupported_2 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_2)
+        cls._supported = utils.copy_file(cls._dir,test_data.SUPPORTED_CODE_FILE_PATH)
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
 
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^mp_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
+        # Clean the copies and the intermediate files created while parsing
+        shutil.rmtree(cls._dir)
 
     def test_open_acc_object_from_basic_file(self):
         """
@@ -132,12 +137,6 @@ class TestOpenACCDataDirective(unittest.TestCase):
             data=test_data.METADATA_FOR_SIMPLE_CODE_FUNCTION_LOOP
         )
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^acc_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
     def test_open_acc_data_directive(self):
         """ 
         The follwing is the code thats is intended to be parallelized.
@@ -266,12 +265,6 @@ class TestOpenACCParallelLoopDirective(unittest.TestCase):
             data=test_data.METADATA_FOR_SIMPLE_CODE_FUNCTION_LOOP
         )
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^acc_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
 
     def test_parallel_loop_directive(self):
 
@@ -371,12 +364,6 @@ class TestOpenACCLoopDirective(unittest.TestCase):
             data=test_data.METADATA_FOR_SIMPLE_CODE_FUNCTION_LOOP
         )
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^acc_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
 
     def test_loop_directive(self):
 
@@ -1,11 +1,14 @@
 # -*- encoding: utf-8 -*-
 
 from pragcc.core import parallelizer, metadata, code
+from pragcc.core.parser.c99 import tsparser
 from pragcc.core.parser.c99.pycparser.plyparser import ParseError
 
 from tests import utils
 from tests.pragcc import test_data
 
+import shutil
+import tempfile
 import unittest
 
 
@@ -18,22 +21,27 @@ def pragmas_equals(a,b):
 
 class TestOpenMPObject(unittest.TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+
+        # The tests of this class work on their own copy of the files, so
+        # the files created while parsing do not collide when the tests run
+        # in parallel, for example with pytest -n auto. The copies are kept
+        # for the whole class, so the parsed files are cached between tests.
+        cls._dir = tempfile.mkdtemp()
 
-        # Set of files to test code annotation with OpenMP directives
-        self._basic = test_data.BASIC_FILE_PATH
-        self._complex = test_data.COMPLEX_FILE_PATH
-        self._empty = test_data.EMPTY_FILE_PATH
-        self._unsupported_1 = test_data.UNSUPPORTED_CODE_FILE_PATH_1
-        self._unsupported_2 = test_data.UNSUPPORTED_CODE_FILE_PATH_2
-        self._supported = test_data.SUPPORTED_CODE_FILE_PATH
+        cls._basic = utils.copy_file(cls._dir,test_data.BASIC_FILE_PATH)
+        cls._complex = utils.copy_file(cls._dir,test_data.COMPLEX_FILE_PATH)
+        cls._empty = utils.copy_file(cls._dir,test_data.EMPTY_FILE_PATH)
+        cls._unsupported_1 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_1)
+        cls._unsupported_2 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_2)
+        cls._supported = utils.copy_file(cls._dir,test_data.SUPPORTED_CODE_FILE_PATH)
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
 
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^mp_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
+        # Clean the copies and the intermediate files created while parsing
+        shutil.rmtree(cls._dir)
 
     def test_open_mp_object_from_basic_file(self):
         """
@@ -65,10 +73,26 @@ class TestOpenMPObject(unittest.TestCase):
         omp = parallelizer.OpenMP(file_path=self._complex)
         self.assertIsInstance(omp,parallelizer.OpenMP)
 
+    def test_open_mp_objects_from_the_same_file(self):
+        """
+            The parsed code is cached per file, but each OpenMP 
+            object must be able to change its code without changing 
+            the code of the others.
+        """
+        omp_1 = parallelizer.OpenMP(file_path=self._complex)
+        omp_2 = parallelizer.OpenMP(file_path=self._complex)
+
+        raw_code = omp_2.code.get_function_raw('evolve')
+        omp_1.code.update_function_raw_code('evolve','')
+
+        self.assertEqual(omp_1.code.get_function_raw('evolve'),'')
+        self.assertEqual(omp_2.code.get_function_raw('evolve'),raw_code)
+
     def test_openmp_object_from_empty_code_file(self):
         with self.assertRaises(IndexError):
             omp = parallelizer.OpenMP(file_path=self._empty)
 
+    @unittest.skipIf(tsparser.AVAILABLE,'tree-sitter is used instead of pycparser')
     def test_open_mp_object_from_unsupported_code_1(self):
         """ 
             The C preprocessor used by pycparse for code parsing do not support
@@ -78,6 +102,16 @@ class TestOpenMPObject(unittest.TestCase):
         with self.assertRaises(ParseError):
             omp = parallelizer.OpenMP(file_path=self._unsupported_1)
 
+    @unittest.skipUnless(tsparser.AVAILABLE,'tree_sitter_languages is not installed')
+    def test_open_mp_object_from_unsupported_code_1_with_tree_sitter(self):
+        """
+            Tree-sitter parses the bool type, but the code has no
+            includes, so it can not be splitted in sections.
+        """
+        with self.assertRaises(IndexError):
+            omp = parallelizer.OpenMP(file_path=self._unsupported_1)
+
+    @unittest.skipIf(tsparser.AVAILABLE,'tree-sitter is used instead of pycparser')
     def test_open_mp_object_from_unsupported_code_2(self):
         """ 
             We include the stdbool.h header library on which the bool 
@@ -103,6 +137,15 @@ class TestOpenMPObject(unittest.TestCase):
         with self.assertRaises(ParseError):
             omp = parallelizer.OpenMP(file_path=self._unsupported_2)
 
+    @unittest.skipUnless(tsparser.AVAILABLE,'tree_sitter_languages is not installed')
+    def test_open_mp_object_from_unsupported_code_2_with_tree_sitter(self):
+        """
+            Tree-sitter parses the original code, the stdbool.h header
+            is not removed, so the bool type is recognized.
+        """
+        omp = parallelizer.OpenMP(file_path=self._unsupported_2)
+        self.assertIsInstance(omp,parallelizer.OpenMP)
+
     def test_openmp_object_from_supported_code(self):
         """
 
@@ -126,6 +169,27 @@ class TestOpenMPObject(unittest.TestCase):
         self.assertIsInstance(omp,parallelizer.OpenMP)
 
 
+class TestOpenMPObjectFromRawCode(unittest.TestCase):
+
+    def test_open_mp_object_from_a_preloaded_raw_code(self):
+        """
+            A raw code preloaded after it is compiled is not parsed 
+            again by the OpenMP object.
+        """
+        parallelizer._load_code_from_text.cache_clear()
+        parallelizer.preload_code(test_data.SIMPLE_CODE_FUNCTION_LOOP)
+        cache_info = parallelizer._load_code_from_text.cache_info()
+        hits = cache_info.hits
+
+        # Without tree-sitter the code is parsed only once
+        self.assertEqual(cache_info.misses,2 if tsparser.AVAILABLE else 1)
+
+        omp = parallelizer.OpenMP(raw_code=test_data.SIMPLE_CODE_FUNCTION_LOOP)
+
+        self.assertEqual(parallelizer._load_code_from_text.cache_info().hits,hits + 1)
+        self.assertIn('some_function',omp.code.get_function_raw('some_function'))
+
+
 class TestParallelDirective(unittest.TestCase):
 
     def setUp(self):
@@ -139,12 +203,6 @@ class TestParallelDirective(unittest.TestCase):
             data=test_data.METADATA_FOR_SIMPLE_CODE_FUNCTION_LOOP
         )
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^mp_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
     def test_parallel_directive(self):
         """ 
         The follwing is the code thats is intended to be parallelized.
@@ -280,12 +338,6 @@ class TestOpenMPParallelForDirective(unittest.TestCase):
         )
 
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^mp_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
     def test_parallel_for_directive(self):
 
         # Getting the OpenMP directives of each function from
@@ -425,12 +477,6 @@ class TestOpenMPWholeParallelization(unittest.TestCase):
             data=test_data.METADATA_FOR_SIMPLE_CODE_FUNCTION_LOOP
         )
 
-    def tearDown(self):
-        # Clean intermediate files created during code annotation
-        utils.purge(test_data.TEST_DIR,r'^fake_*')
-        utils.purge(test_data.TEST_DIR,r'^mp_*')
-        utils.purge(test_data.TEST_DIR,r'^ccode_*')
-
     def test_parallelize_method(self):
         # NOTE: we need to check the paralwllization was
         # driven correctly.
@@ -1,27 +1,39 @@
 # -*- encoding: utf-8 -*-
 
-from pragcc.core.parser.c99 import parser
+from pragcc.core.parser.c99 import parser, tsparser
 from pragcc.core.parser.c99.pycparser.c_ast import FileAST
 from pragcc.core.parser.c99.pycparser.plyparser import ParseError
 
 from tests import utils
 from tests.pragcc import test_data
 
+import os
+import shutil
+import tempfile
 import unittest
 
 
 class TestCCodeParsing(unittest.TestCase):
     
-    def setUp(self):
-        self._basic = test_data.BASIC_FILE_PATH
-        self._complex = test_data.COMPLEX_FILE_PATH
-        self._empty = test_data.EMPTY_FILE_PATH
-        self._unsupported_1 = test_data.UNSUPPORTED_CODE_FILE_PATH_1
-        self._unsupported_2 = test_data.UNSUPPORTED_CODE_FILE_PATH_2
-        self._supported = test_data.SUPPORTED_CODE_FILE_PATH
+    @classmethod
+    def setUpClass(cls):
 
-    def tearDown(self):
-        utils.purge(dir=test_data.TEST_DIR,pattern='fake_*')
+        # Parsing writes fake_* files next to the parsed file, so the
+        # tests of this class parse their own copies
+        cls._dir = tempfile.mkdtemp()
+
+        cls._basic = utils.copy_file(cls._dir,test_data.BASIC_FILE_PATH)
+        cls._complex = utils.copy_file(cls._dir,test_data.COMPLEX_FILE_PATH)
+        cls._empty = utils.copy_file(cls._dir,test_data.EMPTY_FILE_PATH)
+        cls._unsupported_1 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_1)
+        cls._unsupported_2 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_2)
+        cls._supported = utils.copy_file(cls._dir,test_data.SUPPORTED_CODE_FILE_PATH)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        # Clean the copies and the intermediate files created while parsing
+        shutil.rmtree(cls._dir)
 
     def test_parse_basic_code_file(self):
         ast = parser.parse_cfile(file_path=self._basic)
@@ -55,4 +67,95 @@ class TestCCodeParsing(unittest.TestCase):
         ast = parser.parse_cfile(file_path=self._supported)
         self.assertIsInstance(ast,FileAST)
 
+    def test_parse_code_defining_a_fake_type(self):
+        """Types of the fake headers can be used if the code defines them."""
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path,'defined_bool.c')
+
+            with open(file_path,'w') as file:
+                file.write('typedef int bool;\nbool function(){ return 0; }\n')
+
+            ast = parser.parse_cfile(file_path=file_path)
+            self.assertIsInstance(ast,FileAST)
+
+    def test_parse_code_using_bool_as_a_name(self):
+        """Only the bool type needs the fake headers to be included."""
+        codes = [
+            'struct point { int Window; int uint; };\n',
+            'int bool = 1;\n',
+            'struct s { int bool; };\n',
+            'typedef int bool, *pbool;\nbool value;\n'
+        ]
+
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path,'names.c')
+
+            for raw_code in codes:
+                with open(file_path,'w') as file:
+                    file.write('#include <stdio.h>\n' + raw_code)
+
+                ast = parser.parse_cfile(file_path=file_path)
+                self.assertIsInstance(ast,FileAST)
+
+    def test_parse_code_with_a_commented_include(self):
+        """A commented include is still replaced by a fake header."""
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path,'commented.c')
+
+            with open(file_path,'w') as file:
+                file.write(
+                    '#include <stdio.h>\n'
+                    '// #include <stdlib.h>\n'
+                    'size_t f(size_t n){ return n; }\n'
+                )
+
+            ast = parser.parse_cfile(file_path=file_path)
+            self.assertIsInstance(ast,FileAST)
+
+
+@unittest.skipUnless(tsparser.AVAILABLE,'tree_sitter_languages is not installed')
+class TestCCodeTreeSitterParsing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        # Parsing writes fake_* files next to the parsed file, so the
+        # tests of this class parse their own copies
+        cls._dir = tempfile.mkdtemp()
+
+        cls._complex = utils.copy_file(cls._dir,test_data.COMPLEX_FILE_PATH)
+        cls._unsupported_2 = utils.copy_file(cls._dir,test_data.UNSUPPORTED_CODE_FILE_PATH_2)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        # Clean the copies and the intermediate files created while parsing
+        shutil.rmtree(cls._dir)
+
+    def test_same_data_as_pycparser(self):
+        data = tsparser.get_data_from_cfile(file_path=self._complex)
+        expected_data = parser.get_data_from_cfile(file_path=self._complex)
+        self.assertEqual(data,expected_data)
+
+    def test_parse_bool_type_without_fake_headers(self):
+        # The bool type is known when stdbool.h is the first include
+        funcdefs = tsparser.parse_cfile(file_path=self._unsupported_2)
+        names = [funcdef.decl.name for funcdef in funcdefs]
+        self.assertEqual(names,['function','main'])
+
+    def test_conditional_code_inside_a_function_is_not_parsed(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path,'ifdef.c')
+
+            with open(file_path,'w') as file:
+                file.write(
+                    'void function(int *a){\n'
+                    '#ifdef FAST\n'
+                    '    for (int i = 0; i < 10; i++) a[i] = 0;\n'
+                    '#else\n'
+                    '    for (int i = 0; i < 10; i++) a[i] = 1;\n'
+                    '#endif\n'
+                    '}\n'
+                )
 
+            self.assertIsNone(tsparser.parse_cfile(file_path=file_path))
@@ -2,11 +2,31 @@
 
 import os
 import re
+import shutil
 
 def purge(dir, pattern):
-    """
+    """Remove the files in dir whose name matches the given pattern.
+
+    The directory is listed once even if several patterns are given.
+
+    Args:
+        dir (str): The directory to be cleaned.
+        pattern (str or List[str]): A regular expression, or a list of 
+            them, a file is removed if any of them matches its name.
+
     https://stackoverflow.com/questions/1548704/delete-multiple-files-matching-a-pattern
     """
-    for f in os.listdir(dir):
-        if re.search(pattern, f):
-            os.remove(os.path.join(dir, f))
\ No newline at end of file
+    if not isinstance(pattern, str):
+        pattern = '|'.join('(?:%s)' % p for p in pattern)
+
+    regex = re.compile(pattern)
+
+    # os.scandir is not a context manager before Python 3.6
+    for entry in os.scandir(dir):
+        if regex.search(entry.name):
+            os.remove(entry.path)
+
+
+def copy_file(dir, file_path):
+    """Copy a file into dir and return the path to the copy."""
+    return shutil.copy(file_path, dir)